@@ -3,7 +3,6 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import List, Mapping, Optional, \
     Tuple, Union, Dict, overload
-from itertools import combinations
 import random
 from .tiles import BonusTile, Bonuses, Honors, Simples, Tile, Wind
 from .melds import Chow, Kong, Meld, Pong, Wu, WuFlag
@@ -49,6 +48,30 @@ class TurnWon(TurnEnding):
     winner: Player
     wu: Wu
 
+def _build_wall() -> Tuple[Tile, ...]:
+    """Build one of every physical tile in a full set."""
+    wall: List[Tile] = []
+    # simples
+    for suit in Simples:
+        for num in range(9):
+            wall.extend([Tile(suit, num) for _ in range(4)])
+    # honors
+    for wind in range(4):
+        wall.extend([Tile(Honors.FENG, wind) for _ in range(4)])
+    for dragon in range(3):
+        wall.extend([Tile(Honors.LONG, dragon) for _ in range(4)])
+    # bonuses
+    for i in range(4):
+        wall.append(BonusTile(Bonuses.HUA, i))
+        wall.append(BonusTile(Bonuses.GUI, i))
+    return tuple(wall)
+
+# Tiles are never mutated, so every hand shuffles the same 144 objects
+# instead of constructing (and validating) them again. The four copies
+# of each tile are still distinct objects, which identity checks such as
+# ArrivedIO.playable_hand rely on.
+_WALL = _build_wall()
+
 # game process classes
 
 class Game:
@@ -282,20 +305,7 @@ class Hand:
 
     def shuffle(self):
         """Generate and shuffle a new wall."""
-        wall = []
-        # simples
-        for suit in Simples:
-            for num in range(9):
-                wall.extend([Tile(suit, num) for _ in range(4)])
-        # honors
-        for wind in range(4):
-            wall.extend([Tile(Honors.FENG, wind) for _ in range(4)])
-        for dragon in range(3):
-            wall.extend([Tile(Honors.LONG, dragon) for _ in range(4)])
-        # bonuses
-        for i in range(4):
-            wall.append(BonusTile(Bonuses.HUA, i))
-            wall.append(BonusTile(Bonuses.GUI, i))
+        wall = list(_WALL)
         random.shuffle(wall)
         self.wall = wall
         self.discarded = []
@@ -450,6 +460,30 @@ class Turn:
                 dragons[m.tiles[0].number] = True
         return all(dragons)
 
+    @staticmethod
+    def chows_with(tile: Tile, hand: List[Tile]) -> List[Chow]:
+        """Return every distinct Chow that ``tile`` can complete.
+
+        Args:
+            tile: The tile that would join the Chow.
+            hand: The tiles that may supply the other two.
+        """
+        if not tile.is_simple:
+            return []
+        # one representative tile per number of the same suit
+        by_num: Dict[int, Tile] = {}
+        for other in hand:
+            if other.suit == tile.suit:
+                by_num.setdefault(other.number, other)
+        by_num[tile.number] = tile
+        chows: List[Chow] = []
+        for low in range(max(tile.number - 2, 0), min(tile.number, 6) + 1):
+            trip = tuple(by_num.get(num) for num in range(low, low + 3))
+            if all(trip):
+                # already sorted and consecutive, no need to check
+                chows.append(Chow._unchecked(trip))
+        return chows
+
     def melds_from_discard(self, player: Player, last_ending: TurnNext):
         """Check for possible melds to make from the discard tile.
 
@@ -467,16 +501,13 @@ class Turn:
         if last_ending.discard is None:
             return None
         melds: List[Meld] = []
-        for pair in combinations(player.hand, 2):
-            meld = Wu.get_triplet([*pair, last_ending.discard])
-            if meld is not None and meld not in melds:
-                melds.append(meld)
-        for triplet in combinations(player.hand, 3):
-            if all(tile == last_ending.discard for tile in triplet):
-                # Exposed Kong
-                meld = Kong([*triplet, last_ending.discard])
-                if meld not in melds:
-                    melds.append(meld)
+        same = [tile for tile in player.hand if tile == last_ending.discard]
+        if len(same) >= 2:
+            melds.append(Pong._unchecked((*same[:2], last_ending.discard)))
+        melds.extend(self.chows_with(last_ending.discard, player.hand))
+        if len(same) >= 3:
+            # Exposed Kong
+            melds.append(Kong._unchecked((*same[:3], last_ending.discard)))
         try:
             wu = Wu([*player.hand, last_ending.discard], player.shown,
                     last_ending.discard, last_ending.prev_seat)
@@ -513,10 +544,13 @@ class Turn:
             or :obj:`None` if the player chose not to meld.
         """
         kongs: List[Kong] = []
-        for quadruplet in combinations(player.hand, 4):
-            if all(tile == quadruplet[0] for tile in quadruplet):
+        groups: Dict[Tile, List[Tile]] = {}
+        for tile in player.hand:
+            groups.setdefault(tile, []).append(tile)
+        for group in groups.values():
+            if len(group) >= 4:
                 # Exposed Kong From Concealed Pong
-                kong = Kong(quadruplet)
+                kong = Kong._unchecked(tuple(group[:4]))
                 kongs.append(kong)
         if kongs:
             question = qna.ShowEKFCP(gen=self.gen, melds=kongs,
@@ -535,14 +569,14 @@ class Turn:
             except ValueError:
                 continue
             if meld.tiles[0] in player.hand:
-                kong = Kong(meld.tiles + (player.hand[match],))
+                kong = Kong._unchecked(meld.tiles + (player.hand[match],))
                 kongs.append(kong)
         if kongs:
             question = qna.ShowEKFEP(
                 gen=self.gen, melds=kongs, player=player, arrived=draw)
             answer: Optional[Kong] = (yield question)
             if answer is not None:
-                player.shown.remove(Pong(answer.tiles[:3]))
+                player.shown.remove(Pong._unchecked(answer.tiles[:3]))
                 player.hand.remove(answer.tiles[0])
             return answer
         return None
@@ -593,32 +627,21 @@ class Turn:
             asked at all whether to meld.
         """
         overall: Mapping[Player, List[Meld]] = {}
+        next_player = self.players[(victim.seat + 1) % 4]
         for player in self.players:
             if player is victim:
                 continue
             melds: List[Meld] = overall.setdefault(player, [])
-            for pair in combinations(player.hand, 2):
-                try:
-                    meld = Pong([*pair, discard])
-                except ValueError:
-                    pass
-                else:
-                    if meld not in melds:
-                        melds.append(meld)
-                if player is self.players[(victim.seat + 1) % 4]:
-                    try:
-                        meld = Chow([*pair, discard])
-                    except ValueError:
-                        continue
-                    if meld not in melds:
-                        melds.append(meld)
-            for triplet in combinations(player.hand, 3):
-                try:
-                    meld = Kong([*triplet, discard])
-                except ValueError:
-                    continue
-                if meld not in melds:
-                    melds.append(meld)
+            # Only tiles equal to the discard can form a Pong or Kong
+            # with it, so count those instead of trying every pair
+            # and triplet of tiles in the hand.
+            same = [tile for tile in player.hand if tile == discard]
+            if len(same) >= 2:
+                melds.append(Pong._unchecked((*same[:2], discard)))
+            if player is next_player:
+                melds.extend(self.chows_with(discard, player.hand))
+            if len(same) >= 3:
+                melds.append(Kong._unchecked((*same[:3], discard)))
             try:
                 wu = Wu([*player.hand, discard], player.shown, discard, victim.seat)
             except ValueError:
@@ -642,4 +665,4 @@ class Turn:
                         and discard not in self.hand.discarded[:-1]:
                     self.hand._gave_kong[player] = victim
                 return (player, answer)
-        return (None, bool(overall[self.players[(victim.seat + 1) % 4]]))
+        return (None, bool(overall[next_player]))
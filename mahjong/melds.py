@@ -1,9 +1,10 @@
 """Contains classes representing melds that check their validity."""
 from __future__ import annotations
 from enum import Flag
-from itertools import combinations
-from typing import Optional, Sequence, Union, Iterable, List, Iterator, TypeVar, Type, Tuple
-from .tiles import Honors, Tile, Simples, Bonuses, Misc, Wind
+from itertools import combinations, product
+from threading import Lock
+from typing import Optional, Sequence, Union, Iterable, List, Iterator, TypeVar, Type, Tuple, Dict
+from .tiles import Honors, Tile, Misc, Wind, NUM_CODES
 
 __all__ = [
     'WuFlag',
@@ -137,11 +138,26 @@ class WuFlag(Flag):
     HAND_OF_BONUSES = 1 << 36
 
 # special case: 1 & 9 of each suit + every value of honors suits
-THIRTEEN_ORPHANS = set(map(Tile.from_str, (
+THIRTEEN_ORPHANS = frozenset(map(Tile.from_str, (
     'tong/1|tong/9|zhu/1|zhu/9|wan/1|wan/9|'  # simples
     'feng/1|feng/2|feng/3|feng/4|long/1|long/2|long/3'  # honors
 ).split('|')))
 
+# THIRTEEN_ORPHANS as a bitmask of tile codes
+_THIRTEEN_ORPHANS_MASK = 0
+for _tile in THIRTEEN_ORPHANS:
+    _THIRTEEN_ORPHANS_MASK |= 1 << _tile.code
+del _tile
+
+# melds of these tiles are always worth a faan
+_DRAGON_FLAGS: Dict[Tile, WuFlag] = {
+    Tile.from_str('long/1'): WuFlag.RED_DRAGON,
+    Tile.from_str('long/2'): WuFlag.GREEN_DRAGON,
+    Tile.from_str('long/3'): WuFlag.WHITE_DRAGON,
+}
+# wind tiles by Wind, for seat and prevailing wind melds
+_WIND_TILES = tuple(Tile(Honors.FENG, wind) for wind in Wind)
+
 FLAG_FAAN = {
     WuFlag.CHICKEN_HAND: 0,
     WuFlag.COMMON_HAND: 1, WuFlag.ALL_IN_TRIPLETS: 3,
@@ -164,6 +180,34 @@ FLAG_FAAN = {
     WuFlag.TABLE_OF_SEASONS: 2, WuFlag.HAND_OF_BONUSES: 8,
 }
 
+# A meld of a cached combo: either its position in Wu.fixed_melds, or its
+# class and the positions of its tiles in (sorted) Wu.tiles. Tiles are
+# told apart by identity, so the cache never holds any Tile itself.
+_PackedMeld = Union[int, Tuple[Type['Meld'], Tuple[int, ...]]]
+# Wu meld combos by (type, hidden tile counts, fixed melds), least recently
+# used first. Finding them is by far the most expensive part of a Wu, and
+# the game tries the same hands repeatedly (e.g. every player against
+# every discard).
+_COMBO_CACHE: Dict[tuple, Tuple[Tuple[_PackedMeld, ...], ...]] = {}
+_COMBO_CACHE_SIZE = 1024
+# Wus may be built in several threads at once (see Wu), so changes to
+# the cache are serialized; lookups need no lock
+_COMBO_CACHE_LOCK = Lock()
+
+# FLAG_FAAN indexed by bit position, for faan()
+_FAAN_TABLE = [0] * max(flag.value for flag in WuFlag).bit_length()
+for _flag, _points in FLAG_FAAN.items():
+    if _flag.value:
+        _FAAN_TABLE[_flag.value.bit_length() - 1] = _points
+del _flag, _points
+
+# one bit per kind of meld, see Meld._kind
+_CHOW = 1 << 0
+_PONG = 1 << 1
+_KONG = 1 << 2
+_EYES = 1 << 3
+_WU = 1 << 4
+
 def _tname(obj) -> str:
     return type(obj).__name__
 
@@ -181,17 +225,37 @@ class Meld:
         tiles: See Args.
     """
 
+    # melds are created by the hundred thousand for some hands
+    __slots__ = ('tiles', '_hash')
+
     @property
     def size(self) -> Union[int, range]:
         """Valid size of this meld."""
         raise NotImplementedError
 
     tiles: Tuple[Tile, ...]
+    _hash: int
+    _kind: int = 0
+    # rank when sorting different kinds of melds; lower sorts first
+    _ORDER: int
 
     def __init__(self, tiles: Iterable[Tile]):
         self.tiles = tuple(sorted(tiles))
+        self._hash = hash((type(self),) + self.tiles)
         self.check_meld()
 
+    @classmethod
+    def _unchecked(cls: Type[Self], tiles: Tuple[Tile, ...]) -> Self:
+        """Make a meld without checking its validity.
+
+        Only for internal use where the tiles are known to be valid
+        for this meld and already sorted.
+        """
+        self = cls.__new__(cls)
+        self.tiles = tiles
+        self._hash = hash((cls,) + tiles)
+        return self
+
     @classmethod
     def from_str(cls: Type[Self], s: str) -> Self:
         """Meld.from_str('suit1/num1|...') -> Meld"""
@@ -199,41 +263,36 @@ class Meld:
 
     def __str__(self) -> str:
         """str(meld) -> 'suit1/num1|suit2/num2|...'"""
-        tiles = list(self.tiles)
-        if isinstance(self, Wu):
-            for meld in self.fixed_melds:
-                tiles.extend(meld.tiles)
-        tiles.sort()
-        return '|'.join(map(str, tiles))
+        return '|'.join(map(str, self.tiles))
 
     __repr__ = __str__
 
     def __hash__(self) -> int:
-        return hash((type(self),) + self.tiles)
+        # tiles never change after initialization, so neither does this
+        return self._hash
 
     def __eq__(self, other: Meld) -> bool:
         """Two Melds are equal if they are same type and same tiles."""
         if not isinstance(other, Meld):
             return NotImplemented
-        return hash(self) == hash(other)
+        return type(self) is type(other) and self.tiles == other.tiles
 
     def __lt__(self, other: Meld) -> bool:
-        order = [Wu, Kong, Pong, Chow, Eyes]
         if type(self) is not type(other):
-            return order.index(type(self)) > order.index(type(other))
+            return self._ORDER < other._ORDER
         return self.tiles < other.tiles
 
     def check_meld(self) -> None:
         """Check validity of the meld. Raises ValueError upon failure."""
         self.check_size()
         for tile in self.tiles:
-            if isinstance(tile.suit, Bonuses):
+            if tile.is_bonus:
                 raise ValueError('No Bonus tiles in a meld')
 
     def check_size(self) -> None:
         """Check that the meld is the right size."""
         if isinstance(self.size, range) and isinstance(self, Wu):
-            size = len(self.all_tiles)
+            size = len(self._all_tiles)
             if size not in self.size:
                 start, stop = self.size.start, self.size.stop
                 raise ValueError(f'{_tname(self)} must be '
@@ -248,7 +307,7 @@ class Meld:
         """Check that all tiles are the same suit."""
         suit = self.tiles[0].suit
         for tile in self.tiles[1:]:
-            if tile.suit != suit:
+            if tile.suit is not suit:
                 raise ValueError(
                     f'{_tname(self)} must be all one suit: '
                     f'{suit} != {tile.suit}'
@@ -257,6 +316,8 @@ class Meld:
 class _SameNum(Meld):
     """Base class that provides check_num method."""
 
+    __slots__ = ()
+
     def check_meld(self) -> None:
         """Check validity of the meld."""
         super().check_meld()
@@ -276,12 +337,20 @@ class _SameNum(Meld):
 class Pong(_SameNum):
     """Represents a Pong (three identical tiles)"""
 
+    __slots__ = ()
+
     size: int = 3
+    _kind: int = _PONG
+    _ORDER: int = 2
 
 class Kong(_SameNum):
     """Represents a Kong (four identical tiles, counted as three)"""
 
+    __slots__ = ()
+
     size: int = 4
+    _kind: int = _KONG
+    _ORDER: int = 3
 
     def __str__(self) -> str:
         """Kongs are represented by one faceup, two stacked down, one faceup"""
@@ -291,13 +360,17 @@ class Kong(_SameNum):
 class Chow(Meld):
     """Represents a Chow (three tiles of the same suit with consecutive numbers)"""
 
+    __slots__ = ()
+
     size: int = 3
+    _kind: int = _CHOW
+    _ORDER: int = 1
 
     def check_meld(self) -> None:
         """Check validity as a Chow."""
         super().check_meld()
         self.check_suit()
-        if not isinstance(self.tiles[0].suit, Simples):
+        if not self.tiles[0].is_simple:
             raise ValueError(
                 f'Chows can only be Simples, not {_tname(self.tiles[0].suit)}')
         num = self.tiles[0].number
@@ -309,16 +382,20 @@ class Chow(Meld):
 class Eyes(_SameNum):
     """Represents a pair of Eyes (two identical tiles, only valid in winning hand)"""
 
+    __slots__ = ()
+
     size: int = 2
+    _kind: int = _EYES
+    _ORDER: int = 0
 
 class Wu(Meld):
     """Represents a winning hand. This can only consist of sub-melds.
 
-    Warning:
-        For some hands, instantiating this class is NOT atomic.
-        So far I have discovered hands that take a full second or two.
-        Consider instantiating this class a blocking procedure, and
-        treat it as such, e.g. in asynchronous contexts.
+    Note:
+        Instantiating this class finds every arrangement of the hidden
+        tiles, which takes up to about a millisecond for the hardest
+        hands. Arrangements are cached by the tiles' values, and
+        instances may be made in several threads at once.
 
     Args:
         tiles: Hidden tiles in the winning hand.
@@ -338,21 +415,27 @@ class Wu(Meld):
         base_flags: Flags common to all choices of meld.
     """
 
+    __slots__ = ('melds', 'fixed_melds', 'arrived', 'discarder', 'base_flags',
+                 '_all_tiles', '_tile_flags', '_flags_cache')
+
     size: range = range(14, 19) # [14, 18]
+    _kind: int = _WU
+    _ORDER: int = 4
     melds: List[List[Meld]]
     fixed_melds: List[Meld]
     arrived: Optional[Tile]
     discarder: Optional[Wind]
     base_flags: WuFlag
+    _all_tiles: Tuple[Tile, ...]
+    # flags that depend only on the tiles, not the choice of melds
+    _tile_flags: WuFlag
+    # results of flags() by choice, winds and base flags
+    _flags_cache: Dict[tuple, WuFlag]
 
     @property
     def all_tiles(self) -> List[Tile]:
         """All tiles in the hand, including hidden and exposed."""
-        tiles = list(self.tiles)
-        for meld in self.fixed_melds:
-            tiles.extend(meld.tiles)
-        tiles.sort()
-        return tiles
+        return list(self._all_tiles)
 
     def __init__(self, tiles: Iterable[Tile],
                  melds: Optional[Iterable[Meld]] = None,
@@ -360,11 +443,24 @@ class Wu(Meld):
                  discarder: Optional[int] = None,
                  flags: WuFlag = WuFlag.CHICKEN_HAND):
         self.tiles = tuple(sorted(tiles))
+        self._hash = hash((type(self),) + self.tiles)
         self.fixed_melds = list(melds or [])
+        self._all_tiles = tuple(sorted(self.tiles + tuple(
+            tile for meld in self.fixed_melds for tile in meld.tiles)))
         self.arrived = arrived
         self.discarder = Wind(discarder) if discarder is not None else None
         self.base_flags = flags
+        self._flags_cache = {}
         self.check_meld()
+        # most hands the game tries aren't winning, so only scan the
+        # tiles for scoring once the hand is known to be a Wu
+        self._scan_tiles()
+
+    def __str__(self) -> str:
+        """Wus include the tiles of their fixed melds."""
+        return '|'.join(map(str, self._all_tiles))
+
+    __repr__ = __str__
 
     @classmethod
     def from_str(cls: Type[Wu], s: str, *a, **kw) -> Wu:
@@ -377,51 +473,99 @@ class Wu(Meld):
         Generates all possible winning combinations.
         """
         super().check_meld()
-        # sort each combo of melds, to make out-of-order duplicates
-        # equal, then pass them through a set to weed them out
-        self.melds = list(map(list, {
-            tuple(sorted(combo)) for combo in self.valid_combos()}))
+        # how many of each tile value there are identifies the hidden
+        # tiles, and is much cheaper to hash and compare than the tiles
+        counts = bytearray(NUM_CODES)
+        for tile in self.tiles:
+            counts[tile.code] += 1
+        if max(counts) < 2:
+            # every winning hand needs eyes
+            raise ValueError('No valid combos')
+        key = (type(self), bytes(counts), tuple(self.fixed_melds))
+        packed = _COMBO_CACHE.get(key)
+        if packed is None:
+            self.melds = list(self.valid_combos())
+            packed = self._pack_combos(self.melds)
+        else:
+            # equal counts mean equal tiles at each position of
+            # self.tiles, so the same positions make the same melds
+            self.melds = self._unpack_combos(packed)
+        with _COMBO_CACHE_LOCK:
+            # (re)insert as the most recently used entry
+            _COMBO_CACHE.pop(key, None)
+            if len(_COMBO_CACHE) >= _COMBO_CACHE_SIZE:
+                # evict the least recently used entry
+                del _COMBO_CACHE[next(iter(_COMBO_CACHE))]
+            _COMBO_CACHE[key] = packed
         if not self.melds:
             raise ValueError('No valid combos')
 
+    def _pack_combos(self, combos: List[List[Meld]]
+                     ) -> Tuple[Tuple[_PackedMeld, ...], ...]:
+        """Replace the melds of each combo with their positions."""
+        fixed = {id(meld): i for i, meld in enumerate(self.fixed_melds)}
+        index = {id(tile): i for i, tile in enumerate(self.tiles)}
+        return tuple(tuple(
+            fixed[id(meld)] if id(meld) in fixed
+            else (type(meld), tuple(index[id(tile)] for tile in meld.tiles))
+            for meld in combo
+        ) for combo in combos)
+
+    def _unpack_combos(self, packed: Tuple[Tuple[_PackedMeld, ...], ...]
+                       ) -> List[List[Meld]]:
+        """Rebuild the melds of each combo from this hand's own tiles."""
+        tiles = self.tiles
+        return [[
+            self.fixed_melds[meld] if isinstance(meld, int)
+            else meld[0]._unchecked(tuple(tiles[i] for i in meld[1]))
+            for meld in combo
+        ] for combo in packed]
+
     def valid_combos(self) -> Iterator[List[Meld]]:
-        """Yield all possible winning sets of melds."""
-        tc = len(self.tiles)
-        checked = set()
-        for e1, e2 in combinations(range(tc), 2):
-            if e1 == e2:
-                continue
-            try:
-                test_eyes = Eyes((self.tiles[e1], self.tiles[e2]))
-            except ValueError:
-                continue
-            if test_eyes in checked:
-                continue
-            checked.add(test_eyes)
+        """Yield every distinct winning set of melds, each one sorted."""
+        # Only equal tiles can be eyes, and equal tiles are
+        # interchangeable, so try the first two of each tile value
+        # instead of every pair of indexes.
+        positions: Dict[Tile, List[int]] = {}
+        # which tile values are present, as a bitmask of codes
+        present = 0
+        for i, tile in enumerate(self.tiles):
+            positions.setdefault(tile, []).append(i)
+            present |= 1 << tile.code
+        if present == _THIRTEEN_ORPHANS_MASK:
+            # Ones, nines and honors can't Chow, and there are too few
+            # repeats left to Pong, so this is the only way to win.
+            melds: List[Meld] = [_UncheckedWu(self.tiles)]
+            yield melds
+            return
+        eye_pairs = [idxs[:2] for idxs in positions.values() if len(idxs) >= 2]
+        if len(self.tiles) - 2 == 3 * (4 - len(self.fixed_melds)):
+            # Every tile but the eyes goes in a Chow or Pong, neither of
+            # which crosses suits (or honor values), so each such group
+            # needs a multiple of three tiles once the eyes are out.
+            group_of = [tile.code // 9 if tile.is_simple else tile.code
+                        for tile in self.tiles]
+            groups: Dict[int, int] = {}
+            for group in group_of:
+                groups[group] = groups.get(group, 0) + 1
+            odd = [group for group, count in groups.items() if count % 3]
+            if len(odd) != 1 or groups[odd[0]] % 3 != 2:
+                return
+            eye_pairs = [(e1, e2) for e1, e2 in eye_pairs
+                         if group_of[e1] == odd[0]]
+        # Different choices of tiles can make the same melds, so remember
+        # each combo by its meld hashes (which is what Meld equality
+        # compares) and only sort and yield the ones not seen before.
+        seen = set()
+        for e1, e2 in eye_pairs:
+            test_eyes = Eyes._unchecked((self.tiles[e1], self.tiles[e2]))
             # tiles other than the eyes we're checking
             ts = [x for i, x in enumerate(self.tiles) if i != e1 and i != e2]
-            possible = self.all_melds_pos(ts)
-            combos = combinations(possible, 4 - len(self.fixed_melds))
+            possible = [(meld, sum(1 << i for i in idxs))
+                        for meld, idxs in self.all_melds_pos(ts)]
+            combos = self._disjoint_combos(
+                possible, 4 - len(self.fixed_melds), len(ts))
             for combo in combos:
-                # Try to find two melds using the same index.
-                # The naive way I was previously using was to
-                # slam all the indexes into a set and check its length.
-                # However, when we're dealing with over a million combos,
-                # that gets expensive. Instead, manually loop until we
-                # find a single duplicate, at which point we skip immediately.
-                covered = set()
-                found_dupe = False
-                for _, idxs in combo:
-                    for i in idxs:
-                        if i in covered:
-                            found_dupe = True
-                            break
-                        covered.add(i)
-                    if found_dupe:
-                        break
-                if found_dupe:
-                    # can't have duplicate indexes, skip this combo
-                    continue
                 # NOTE: Removed a check that used to be here that was to
                 # ensure all tiles are used; in a Wu with enough tiles for
                 # Kongs, a choice of four Pongs would not use all tiles.
@@ -430,12 +574,79 @@ class Wu(Meld):
                 # hand (you would have to draw again, so the actual Wu would
                 # be constructed with an EXPOSED Kong), so the check is not
                 # necessary and we save 12 operations per iteration.
-                melds = [meld for meld, idxs in combo] + list(self.fixed_melds)
+                melds = [meld for meld, _ in combo] + list(self.fixed_melds)
                 melds.append(test_eyes)
+                key = tuple(sorted(map(hash, melds)))
+                if key in seen:
+                    continue
+                seen.add(key)
+                melds.sort()
                 yield melds
-        if set(self.tiles) == THIRTEEN_ORPHANS:
-            melds: List[Meld] = [_UncheckedWu(self.tiles)]
-            yield melds
+
+    @staticmethod
+    def _disjoint_combos(possible: List[Tuple[Meld, int]], need: int,
+                         size: int) -> Iterable[Tuple[Tuple[Meld, int], ...]]:
+        """Get every choice of ``need`` melds whose indexes don't overlap.
+
+        Args:
+            possible: Candidate melds with bitmasks of their indexes.
+            need: How many melds to choose.
+            size: How many tiles the indexes are taken from.
+
+        Returns:
+            The choices, in the same order as :func:`itertools.combinations`.
+        """
+        if size != 3 * need:
+            return Wu._overlap_filter(combinations(possible, need))
+        # Every tile has to be used, which makes this an exact cover:
+        # the lowest index not yet covered must be the lowest index of
+        # the next meld, so only those melds need to be tried.
+        by_low: Dict[int, List[int]] = {}
+        for pos, (_, mask) in enumerate(possible):
+            by_low.setdefault(mask & -mask, []).append(pos)
+        full = (1 << size) - 1
+        covers: List[Tuple[int, ...]] = []
+        chosen: List[int] = []
+
+        def search(covered: int) -> None:
+            if covered == full:
+                covers.append(tuple(sorted(chosen)))
+                return
+            uncovered = full & ~covered
+            for pos in by_low.get(uncovered & -uncovered, ()):
+                mask = possible[pos][1]
+                if covered & mask:
+                    continue
+                chosen.append(pos)
+                search(covered | mask)
+                chosen.pop()
+
+        search(0)
+        covers.sort()
+        return [tuple(possible[pos] for pos in cover) for cover in covers]
+
+    @staticmethod
+    def _overlap_filter(combos: Iterable[Tuple[Tuple[Meld, int], ...]]
+                        ) -> Iterator[Tuple[Tuple[Meld, int], ...]]:
+        """Skip the combos in which two melds use the same index."""
+        for combo in combos:
+            # Try to find two melds using the same index.
+            # The naive way I was previously using was to
+            # slam all the indexes into a set and check its length.
+            # However, when we're dealing with over a million combos,
+            # that gets expensive. Instead, each meld's indexes are
+            # a bitmask, and we skip as soon as two of them overlap.
+            covered = 0
+            found_dupe = False
+            for _, mask in combo:
+                if covered & mask:
+                    found_dupe = True
+                    break
+                covered |= mask
+            if found_dupe:
+                # can't have duplicate indexes, skip this combo
+                continue
+            yield combo
 
     @staticmethod
     def get_triplet(trip: List[Tile]) -> Union[Meld, None]:
@@ -447,14 +658,19 @@ class Wu(Meld):
         Returns:
             A meld, if possible; :obj:`None`, if not.
         """
-        try:
-            return Pong(trip)
-        except ValueError:
-            pass
-        try:
-            return Chow(trip)
-        except ValueError:
-            pass
+        if len(trip) != 3:
+            return None
+        tiles = tuple(sorted(trip))
+        if any(tile.is_bonus for tile in tiles):
+            return None
+        low, mid, high = tiles
+        if low == high: # sorted, so mid is equal too
+            return Pong._unchecked(tiles)
+        if low.is_simple \
+                and mid.suit is low.suit and high.suit is low.suit \
+                and mid.number == low.number + 1 \
+                and high.number == low.number + 2:
+            return Chow._unchecked(tiles)
         return None
 
     def all_melds_pos(self, ts: List[Tile]
@@ -463,56 +679,64 @@ class Wu(Meld):
         Modified from
         https://github.com/offe/py-mcr/blob/master/mahjonggrouping.py#L108-L121
         """
-        trips = {}
-        tc = len(ts)
-        for t1, t2, t3 in combinations(range(tc), 3):
-            t1, t2, t3 = trip_idxs = tuple(sorted((t1, t2, t3)))
-            # already checked
-            if trip_idxs in trips:
-                continue
-            # not unique indexes
-            if len(set(trip_idxs)) != 3:
-                continue
-            trip = [ts[i] for i in trip_idxs]
-            meld = self.get_triplet(trip)
+        # group indexes by tile value, so that only tiles that can
+        # actually form a meld together are ever combined
+        by_code: Dict[int, List[int]] = {}
+        for i, tile in enumerate(ts):
+            by_code.setdefault(tile.code, []).append(i)
+        trips: Dict[Tuple[int, ...], Meld] = {}
+        for code, idxs in by_code.items():
             # Removed an attempt to construct a Kong:
             # in real gameplay, there is no way to construct
             # a Kong from your HIDDEN tiles and have it still be a winning
             # hand (you would have to draw again, so the actual Wu would
             # be constructed with an EXPOSED Kong).
             # Thus the Kong would already be constructed; don't do so here.
-            if meld:
-                trips[trip_idxs] = meld
-        return sorted((i, j) for j, i in trips.items())
-
-    def flags(self, choice: Sequence[Meld],
-              winds: Optional[Tuple[int, int]] = None) -> WuFlag:
-        """Get WuFlags that apply to this choice of winning hand.
-
-        Args:
-            choice: Which combination of melds from the possible
-                set to calculate the flags for.
-            winds: If specified as ``(seat, prevailing)``, this provides the
-                necessary context to include :attr:`WuFlag.SEAT_WIND` and
-                :attr:`WuFlag.PREVAILING_WIND`.
-        """
-        all_tiles = self.all_tiles
-        types = self.base_flags
-        if all(isinstance(meld, (Chow, Eyes)) for meld in choice):
-            types |= WuFlag.COMMON_HAND
-        if all(isinstance(meld, (Pong, Kong, Eyes)) for meld in choice):
-            types |= WuFlag.ALL_IN_TRIPLETS
+            # Equal tiles are interchangeable, so a Pong only needs to be
+            # offered at one set of positions; Chows can take any of the
+            # rest. Disjoint sets still allow more than one Pong of a tile.
+            # Melds of equal tiles are equal, so every position shares
+            # one instance instead of building a meld per position.
+            if len(idxs) >= 3:
+                pong = Pong._unchecked(tuple(ts[i] for i in idxs[:3]))
+                for start in range(0, len(idxs) - 2, 3):
+                    trips[tuple(idxs[start:start + 3])] = pong
+            tile = ts[idxs[0]]
+            # codes of the same suit are consecutive, but a Chow
+            # starting past 7 would run into the next suit
+            if not tile.is_simple or tile.number > 6:
+                continue
+            mids = by_code.get(code + 1)
+            highs = by_code.get(code + 2)
+            if not (mids and highs):
+                continue
+            chow = Chow._unchecked((tile, ts[mids[0]], ts[highs[0]]))
+            for trip in product(idxs, mids, highs):
+                trips[tuple(sorted(trip))] = chow
+        # sort by indexes (plain ints) rather than comparing melds
+        return [(meld, idxs) for idxs, meld in sorted(trips.items())]
+
+    def _scan_tiles(self) -> None:
+        """Work out everything in :meth:`flags` that depends only on
+        the tiles, once per hand instead of once per choice."""
         suit = None
         hon = False
-        all_one_suit = False
-        for tile in all_tiles:
-            if isinstance(tile.suit, Honors):
+        mixed_suits = False
+        orphans_only = True
+        counts = [0, 0, 0, 0, 0, 0, 0, 0, 0]
+        for tile in self._all_tiles:
+            if tile.is_honor:
                 hon = True
                 continue
-            if suit is not None and tile.suit != suit:
-                break
-            suit = tile.suit
-        else:
+            if tile.number not in {0, 8}:
+                orphans_only = False
+            if suit is None:
+                suit = tile.suit
+            elif tile.suit is not suit:
+                mixed_suits = True
+            counts[tile.number] += 1
+        types = WuFlag.CHICKEN_HAND
+        if not mixed_suits:
             if hon and suit is None:
                 # no regulars, only honors
                 types |= WuFlag.ALL_HONOR_TILES
@@ -522,62 +746,11 @@ class Wu(Meld):
             else:
                 # regulars (but of one suit) and honors
                 types |= WuFlag.MIXED_ONE_SUIT
-        long: List[Optional[type]] = [None, None, None]
-        for meld in choice:
-            if isinstance(meld, Chow):
-                continue # can't be dragons
-            if meld.tiles[0].suit != Honors.LONG:
-                continue # not dragons
-            long[meld.tiles[0].number] = type(meld)
-        if all(long):
-            if not any(typ is Eyes for typ in long):
-                types |= WuFlag.GREAT_DRAGONS
-            else:
-                types |= WuFlag.SMALL_DRAGONS
-        feng: List[Optional[type]] = [None, None, None, None]
-        for meld in choice:
-            if isinstance(meld, Chow):
-                continue # can't be winds
-            if meld.tiles[0].suit != Honors.FENG:
-                continue # not winds
-            feng[meld.tiles[0].number] = type(meld)
-        if all(feng):
-            if not any(typ is Eyes for typ in feng):
-                types |= WuFlag.GREAT_WINDS
-            else:
-                types |= WuFlag.SMALL_WINDS
-        if len(choice) == 1: # only one possible way this can happen
-            types |= WuFlag.THIRTEEN_ORPHANS
-        if all(isinstance(meld, (Kong, Eyes)) for meld in choice):
-            types |= WuFlag.ALL_KONGS
-        if not self.fixed_melds and WuFlag.ALL_IN_TRIPLETS in types:
-            if WuFlag.SELF_DRAW in types or ( # self draw or
-                self.arrived is not None
-                # stolen discard not in regular melds,
-                and all(self.arrived not in meld.tiles
-                        for meld in choice
-                        if not isinstance(meld, Eyes))
-                # only eyes
-                and all(self.arrived in meld.tiles
-                        for meld in choice
-                        if isinstance(meld, Eyes))
-            ):
-                types |= WuFlag.SELF_TRIPLETS
-        for meld in choice:
-            if isinstance(meld, Chow):
-                break
-            if not isinstance(meld.tiles[0].suit, Simples):
-                break
-            if meld.tiles[0].number not in {0, 8}:
-                break
-        else:
-            types |= WuFlag.ORPHANS
-        counts = [0, 0, 0, 0, 0, 0, 0, 0, 0]
-        goals = [3, 1, 1, 1, 1, 1, 1, 1, 3]
-        suit = all_tiles[0].suit
-        if all_one_suit and isinstance(suit, Simples):
-            for tile in all_tiles:
-                counts[tile.number] += 1
+        if orphans_only:
+            types |= WuFlag.MIXED_ORPHANS
+        # only hands all in one simples suit can be Nine Gates
+        if not (mixed_suits or hon):
+            goals = [3, 1, 1, 1, 1, 1, 1, 1, 3]
             diff = 0
             for i in range(9):
                 if counts[i] == goals[i]:
@@ -589,26 +762,97 @@ class Wu(Meld):
             else:
                 if diff == 1:
                     types |= WuFlag.NINE_GATES
-        favorable = list({
-            'long/1': WuFlag.RED_DRAGON,
-            'long/2': WuFlag.GREEN_DRAGON,
-            'long/3': WuFlag.WHITE_DRAGON
-        }.items())
+        self._tile_flags = types
+
+    def flags(self, choice: Sequence[Meld],
+              winds: Optional[Tuple[int, int]] = None) -> WuFlag:
+        """Get WuFlags that apply to this choice of winning hand.
+
+        Args:
+            choice: Which combination of melds from the possible
+                set to calculate the flags for.
+            winds: If specified as ``(seat, prevailing)``, this provides the
+                necessary context to include :attr:`WuFlag.SEAT_WIND` and
+                :attr:`WuFlag.PREVAILING_WIND`.
+        """
+        # base_flags is part of the key because it may be changed
+        # after initialization (e.g. to add EARTHLY)
+        key = (tuple(choice), None if winds is None else tuple(winds),
+               self.base_flags)
+        types = self._flags_cache.get(key)
+        if types is None:
+            types = self._flags_cache[key] = self._flags(choice, winds)
+        return types
+
+    def _flags(self, choice: Sequence[Meld],
+               winds: Optional[Tuple[int, int]] = None) -> WuFlag:
+        """Uncached implementation of :meth:`flags`."""
+        types = self.base_flags | self._tile_flags
+        favorable = _DRAGON_FLAGS
         if winds is not None:
-            favorable.append((f'feng/{winds[0]+1}', WuFlag.SEAT_WIND))
-            favorable.append((f'feng/{winds[1]+1}', WuFlag.PREVAILING_WIND))
+            favorable = dict(favorable)
+            seat, prevailing = _WIND_TILES[winds[0]], _WIND_TILES[winds[1]]
+            # the seat and prevailing wind may be the same tile
+            favorable[seat] = WuFlag.SEAT_WIND
+            favorable[prevailing] = favorable.get(
+                prevailing, WuFlag.CHICKEN_HAND) | WuFlag.PREVAILING_WIND
+        # one pass over the melds for everything that depends on them
+        kinds = 0 # every kind of meld in this choice
+        long: List[Optional[type]] = [None, None, None]
+        feng: List[Optional[type]] = [None, None, None, None]
+        orphans = True
         for meld in choice:
-            for s, flag in favorable:
-                if meld.tiles[0] == Tile.from_str(s):
-                    types |= flag
-        for tile in all_tiles:
-            if isinstance(tile.suit, Honors):
+            kinds |= meld._kind
+            first = meld.tiles[0]
+            flag = favorable.get(first)
+            if flag is not None:
+                types |= flag
+            if meld._kind == _CHOW:
+                # can't be dragons, winds or orphans
+                orphans = False
                 continue
-            if tile.number in {0, 8}:
-                continue
-            break
-        else:
-            types |= WuFlag.MIXED_ORPHANS
+            if first.suit is Honors.LONG:
+                long[first.number] = type(meld)
+            elif first.suit is Honors.FENG:
+                feng[first.number] = type(meld)
+            if not first.is_simple or first.number not in {0, 8}:
+                orphans = False
+        # these three shapes exclude each other, and only the last
+        # can have any of the flags that need triplets
+        if kinds == _WU: # only one possible way this can happen
+            types |= WuFlag.THIRTEEN_ORPHANS
+        elif not kinds & ~(_CHOW | _EYES):
+            types |= WuFlag.COMMON_HAND
+        elif not kinds & ~(_PONG | _KONG | _EYES):
+            types |= WuFlag.ALL_IN_TRIPLETS
+            if not kinds & ~(_KONG | _EYES):
+                types |= WuFlag.ALL_KONGS
+            if not self.fixed_melds and (
+                WuFlag.SELF_DRAW in types or ( # self draw or
+                    self.arrived is not None
+                    # stolen discard not in regular melds,
+                    and all(self.arrived not in meld.tiles
+                            for meld in choice
+                            if meld._kind != _EYES)
+                    # only eyes
+                    and all(self.arrived in meld.tiles
+                            for meld in choice
+                            if meld._kind == _EYES)
+                )
+            ):
+                types |= WuFlag.SELF_TRIPLETS
+        if all(long):
+            if not any(typ is Eyes for typ in long):
+                types |= WuFlag.GREAT_DRAGONS
+            else:
+                types |= WuFlag.SMALL_DRAGONS
+        if all(feng):
+            if not any(typ is Eyes for typ in feng):
+                types |= WuFlag.GREAT_WINDS
+            else:
+                types |= WuFlag.SMALL_WINDS
+        if orphans:
+            types |= WuFlag.ORPHANS
         if not self.fixed_melds:
             types |= WuFlag.ALL_FROM_WALL
         # unset flags
@@ -660,12 +904,18 @@ class Wu(Meld):
 def faan(flags: WuFlag) -> int:
     """Get faan based on flags."""
     points = 0
-    for flag in WuFlag:
-        if flag in flags:
-            points += FLAG_FAAN[flag]
+    value = flags.value
+    bit = 0
+    while value:
+        if value & 1:
+            points += _FAAN_TABLE[bit]
+        value >>= 1
+        bit += 1
     return points
 
 class _UncheckedWu(Wu):
+    __slots__ = ()
+
     size: int = 14
 
     def __init__(
@@ -675,24 +925,11 @@ class _UncheckedWu(Wu):
         """Don't check validity, that's the whole point"""
         self.tiles = tuple(sorted(tiles)) + tuple(
             tile for meld in (melds or []) for tile in meld.tiles)
+        self._hash = hash((type(self),) + self.tiles)
         self.fixed_melds = []
+        self._all_tiles = tuple(sorted(self.tiles))
 
-if 0:
-    # NOTE: An example of the non-atomicity of Wu() is the following:
-    # 1.25s (3.94s when debug): tong/1|tong/1|tong/1|tong/2|tong/2|tong/2|tong/3|tong/3|tong/3|tong/4|tong/4|tong/4|tong/5|tong/5
-    # Note that fixing even one meld reduces it to atomic:
-    # 0.02s: tong/1|tong/1|tong/1 + tong/2|tong/2|tong/2|tong/3|tong/3|tong/3|tong/4|tong/4|tong/4|tong/5|tong/5
-    # This happens because there's no way around the fact that:
-    # 1. There are 5 ways to make eyes (a pair of 1s, 2s, 3s, 4s, or 5s)
-    # 2. For each of those choices of eyes, there are 58, 45, 27, 39, and 57 different ways to form melds
-    # 3. We have to check the validity of every choice of 4 melds out of those numerous ways, since no melds are fixed
-    # 4. 58C4 + 45C4 + 27C4 + 39C4 + 57C4 = 1,068,076 which is enough to make a real difference in Python
-    # Other timing tests follow
-    # 0.00s: tong/1|tong/9|zhu/1|zhu/9|wan/1|wan/9|feng/1|feng/2|feng/3|feng/4|long/1|long/2|long/3|wan/2
-    # 0.08s: wan/1|wan/1|wan/1|wan/2|wan/3|wan/4|wan/4|wan/5|wan/6|wan/7|wan/8|wan/9|wan/9|wan/9
-    # 0.18s: tong/1|tong/2|tong/3|tong/2|tong/3|tong/4|tong/5|tong/6|tong/7|tong/8|tong/8|tong/8|tong/4|tong/4
-    # 0.32s (no longer supported): feng/1|feng/1|feng/1|feng/1|feng/2|feng/2|feng/2|feng/2|feng/3|feng/3|feng/3|feng/3|feng/4|feng/4|feng/4|feng/4|long/1|long/1
-    # 0.17s: tong/1|tong/1|tong/1|wan/9|wan/9|wan/9|zhu/5|zhu/5|zhu/5|tong/2|tong/2|tong/2|long/1|long/1
-    # 0.00s: zhu/3|zhu/4|zhu/5,zhu/5|zhu/6|zhu/7,zhu/7|zhu/8|zhu/9 + feng/3|feng/3|zhu/4|zhu/5|zhu/6
-    # 0.55s: wan/2|wan/2|wan/2|tong/1|tong/1|tong/1|tong/1|tong/2|tong/3|tong/2|tong/2|tong/2|tong/3|tong/3
-    pass
+    @classmethod
+    def _unchecked(cls, tiles: Tuple[Tile, ...]) -> _UncheckedWu:
+        """Not checking is what the constructor already does."""
+        return cls(tiles)
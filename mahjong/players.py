@@ -1,3 +1,4 @@
+from bisect import insort
 from typing import List, Tuple
 from .tiles import Bonuses, Tile, BonusTile, Wind
 from .melds import Meld, WuFlag, faan
@@ -9,6 +10,8 @@ __all__ = [
 class Player:
     """Represents one Mahjong player."""
 
+    __slots__ = ('seat', 'hand', 'shown', 'bonus')
+
     seat: Wind
     hand: List[Tile]
     shown: List[Meld]
@@ -36,17 +39,27 @@ class Player:
         """Draw a tile from the wall, and keep doing so if it's a Bonus."""
         tile = wall.pop()
         while isinstance(tile, BonusTile):
-            self.bonus.append(tile) # Step 21
-            self.bonus.sort()
+            insort(self.bonus, tile) # Step 21
             tile = wall.pop()
         self.hand.append(tile) # Step 20
         return tile
 
     def show_meld(self, discard: Tile, meld: Meld):
         """Save a meld and remove its tiles from the hand."""
-        self.hand.append(discard)
+        # how many of each tile the meld still needs from the hand
+        needed = {}
         for tile in meld.tiles:
-            self.hand.remove(tile)
+            needed[tile] = needed.get(tile, 0) + 1
+        kept = []
+        for tile in self.hand + [discard]:
+            if needed.get(tile):
+                needed[tile] -= 1
+            else:
+                kept.append(tile)
+        if any(needed.values()):
+            raise ValueError(f'{meld!r} is not in hand')
+        # update in place, like the rest of the game does
+        self.hand[:] = kept
         self.shown.append(meld) # Step 19
 
     def bonus_faan(self) -> Tuple[int, WuFlag]:
@@ -54,27 +67,24 @@ class Player:
         flags = WuFlag.CHICKEN_HAND
         if not self.bonus:
             flags |= WuFlag.NO_BONUSES
-        found = {
-            Bonuses.GUI: [False]*4,
-            Bonuses.HUA: [False]*4
-        }
+        # which numbers of each bonus suit were found, as bitmasks
+        hua = gui = 0
         for tile in self.bonus:
-            if tile.number == self.seat:
-                if tile.suit == Bonuses.HUA:
-                    flags |= WuFlag.ALIGNED_FLOWERS
-                elif tile.suit == Bonuses.GUI:
-                    flags |= WuFlag.ALIGNED_SEASONS
-            found[tile.suit][tile.number] = True
-        for k, v in found.items():
-            if all(v):
-                if k == Bonuses.HUA:
-                    flags |= WuFlag.TABLE_OF_FLOWERS
-                elif k == Bonuses.GUI:
-                    flags |= WuFlag.TABLE_OF_SEASONS
-        if all(map(all, found.values())):
+            if tile.suit is Bonuses.HUA:
+                hua |= 1 << tile.number
+            else:
+                gui |= 1 << tile.number
+        if hua == gui == 0b1111:
             flags = WuFlag.HAND_OF_BONUSES
-        if WuFlag.TABLE_OF_FLOWERS in flags:
-            flags &= ~(WuFlag.ALIGNED_FLOWERS)
-        if WuFlag.TABLE_OF_SEASONS in flags:
-            flags &= ~(WuFlag.ALIGNED_SEASONS)
+            return (faan(flags), flags)
+        seat = 1 << self.seat
+        # a full table includes the aligned one
+        if hua == 0b1111:
+            flags |= WuFlag.TABLE_OF_FLOWERS
+        elif hua & seat:
+            flags |= WuFlag.ALIGNED_FLOWERS
+        if gui == 0b1111:
+            flags |= WuFlag.TABLE_OF_SEASONS
+        elif gui & seat:
+            flags |= WuFlag.ALIGNED_SEASONS
         return (faan(flags), flags)
\ No newline at end of file
@@ -2,14 +2,18 @@ from __future__ import annotations
 from abc import ABC
 from dataclasses import dataclass
 from enum import Enum
+from types import MappingProxyType
 from typing import (
     TYPE_CHECKING, ClassVar, Generator, List,
     Mapping, Optional, Tuple, Union
 )
+from warnings import warn
+
+from .melds import WuFlag
 
 if TYPE_CHECKING:
     from .game import Hand
-    from .melds import Wu, WuFlag, Meld, Kong
+    from .melds import Wu, Meld, Kong
     from .players import Player
     from .tiles import Tile
 
@@ -72,9 +76,10 @@ class Question(Enum):
     READY_Q = 0
     SELF_DRAW_Q = 13
 
-@dataclass
+@dataclass(eq=False)
 class UserIO(ABC):
     """A question to be answered."""
+    __slots__ = ('gen',)
 
     _question: ClassVar[Question]
 
@@ -84,10 +89,9 @@ class UserIO(ABC):
 
         .. deprecated:: 2.0.0
         """
-        from warnings import warn
         warn('The question attribute is deprecated '
              'in favor of checking the type of the question '
-             'using isinstance().', DeprecationWarning)
+             'using isinstance().', DeprecationWarning, stacklevel=2)
         return self._question
 
     gen: Generator
@@ -106,13 +110,15 @@ class UserIO(ABC):
                          if hasattr(self, attr))
         return f'{type(self).__name__}({args})'
 
-@dataclass
+@dataclass(eq=False)
 class PlayeredIO(UserIO, ABC):
     """A :class:`UserIO` with a :attr:`~PlayeredIO.player` attribute.
 
     Attributes:
         player: See specific subclasses' docs.
     """
+    __slots__ = ('player',)
+
     player: Player
 
     @property
@@ -125,13 +131,15 @@ class PlayeredIO(UserIO, ABC):
         """Shortcut to ``.player.shown``."""
         return self.player.shown
 
-@dataclass
+@dataclass(eq=False)
 class ArrivedIO(PlayeredIO, ABC):
     """A :class:`PlayeredIO` with an :attr:`arrived` attribute.
 
     Attributes:
         arrived: See specific subclasses' docs.
     """
+    __slots__ = ('arrived',)
+
     arrived: Tile
 
     @property
@@ -148,7 +156,7 @@ class ArrivedIO(PlayeredIO, ABC):
         """
         return any(tile is self.arrived for tile in self.hand)
 
-@dataclass
+@dataclass(eq=False)
 class DiscardWhat(ArrivedIO):
     """Which tile would you like to discard?
 
@@ -160,6 +168,8 @@ class DiscardWhat(ArrivedIO):
         last_meld: The meld that was made most recently.
             :obj:`None` if purely a draw.
     """
+    __slots__ = ('last_meld',)
+
     _question = Question.DISCARD_WHAT
 
     last_meld: Optional[Meld]
@@ -173,7 +183,7 @@ class DiscardWhat(ArrivedIO):
         """
         return super().answer(ans)
 
-@dataclass
+@dataclass(eq=False)
 class MeldFromDiscardQ(ArrivedIO):
     """What meld would you like to make from the last discard?
 
@@ -184,6 +194,8 @@ class MeldFromDiscardQ(ArrivedIO):
         arrived: The last discard in question
             (**not** present in the player's hand).
     """
+    __slots__ = ('melds',)
+
     _question = Question.MELD_FROM_DISCARD_Q
 
     melds: List[Meld]
@@ -197,16 +209,18 @@ class MeldFromDiscardQ(ArrivedIO):
         """
         return super().answer(ans)
 
-@dataclass
+@dataclass(eq=False)
 class ReadyQ(UserIO):
     """The round has just ended, are you ready to continue to the next one?"""
+    __slots__ = ()
+
     _question = Question.READY_Q
 
     def answer(self):
         """Answer to continue."""
         return super().answer()
 
-@dataclass
+@dataclass(eq=False)
 class RobKongQ(PlayeredIO):
     """Do you want to rob someone's Kong to win?
 
@@ -214,6 +228,8 @@ class RobKongQ(PlayeredIO):
         melds: A 1-list containing the winning hand that can be made.
         player: The player that can win with this hand.
     """
+    __slots__ = ('melds',)
+
     _question = Question.ROB_KONG_Q
 
     melds: List[Wu]
@@ -226,7 +242,7 @@ class RobKongQ(PlayeredIO):
         """
         return super().answer(ans)
 
-@dataclass
+@dataclass(eq=False)
 class SelfDrawQ(ArrivedIO):
     """You have drawn a tile that you can win with, would you like to?
 
@@ -235,6 +251,8 @@ class SelfDrawQ(ArrivedIO):
         player: The player that can win with this hand.
         arrived: The tile that was drawn (already in the :attr:`hand`).
     """
+    __slots__ = ('melds',)
+
     _question = Question.SELF_DRAW_Q
 
     melds: List[Wu]
@@ -247,7 +265,7 @@ class SelfDrawQ(ArrivedIO):
         """
         return super().answer(ans)
 
-@dataclass
+@dataclass(eq=False)
 class ShowEKFCP(ArrivedIO):
     """Would you like to show an Exposed Kong From Concealed Pong?
 
@@ -260,6 +278,8 @@ class ShowEKFCP(ArrivedIO):
         arrived: The last tile drawn (**already** present in the :attr:`hand`,
             may or may not be related to any of the offered Kongs).
     """
+    __slots__ = ('melds',)
+
     _question = Question.SHOW_EKFCP_Q
 
     melds: List[Kong]
@@ -273,7 +293,7 @@ class ShowEKFCP(ArrivedIO):
         """
         return super().answer(ans)
 
-@dataclass
+@dataclass(eq=False)
 class ShowEKFEP(ShowEKFCP):
     """Same deal as :class:`ShowEKFCP` but exposed Pong instead.
 
@@ -281,9 +301,11 @@ class ShowEKFEP(ShowEKFCP):
         This inherits from :class:`ShowEKFCP`, so call :func:`isinstance`
         on this class **first**, before the other one.
     """
+    __slots__ = ()
+
     _question = Question.SHOW_EKFEP_Q
 
-@dataclass
+@dataclass(eq=False)
 class WhichWu(UserIO):
     """There are multiple valid arrangements of tiles to win;
     which one do you want to win with?
@@ -294,6 +316,8 @@ class WhichWu(UserIO):
         melds: Each list of :class:`Meld` s is a valid combination of them
             to make a winning hand.
     """
+    __slots__ = ('melds',)
+
     _question = Question.WHICH_WU
 
     melds: List[List[Meld]]
@@ -306,7 +330,7 @@ UserIOType = Union[DiscardWhat, MeldFromDiscardQ, ReadyQ, RobKongQ, SelfDrawQ,
 
 # HandEnding
 
-STOCK_TABLES = {
+_STOCK_TABLES = {
     'enwp': {
         1: 1, 2: 1, 3: 1,
         4: 2, 5: 2, 6: 2,
@@ -334,6 +358,20 @@ STOCK_TABLES = {
         10: 13
     }
 }
+# read-only, so that tables derived from them can't go stale
+STOCK_TABLES = MappingProxyType({
+    name: MappingProxyType(table) for name, table in _STOCK_TABLES.items()})
+
+# the default table as a tuple indexed by faan, up to its limit,
+# so that the limit isn't searched for on every hand
+_DEFAULT_BASES = tuple(STOCK_TABLES['random_app'].get(faan)
+                       for faan in range(max(STOCK_TABLES['random_app']) + 1))
+
+# flag bits that points() tests, as plain ints
+_SELF_DRAW = WuFlag.SELF_DRAW.value
+# penalties that only apply to self draws
+_SELF_DRAW_PENALTIES = (WuFlag.TWELVE_PIECE | WuFlag.GAVE_KONG).value
+_GAVE_DRAGON = WuFlag.GAVE_DRAGON.value
 
 class HandResult(Enum):
     """The result of a hand.
@@ -349,13 +387,15 @@ class HandResult(Enum):
     GOULASH = 1
     DEALER_WON = 2
 
-@dataclass
+@dataclass(eq=False)
 class HandEnding(ABC):
     """The ending conditions of a hand.
 
     The implied question is "The hand has just ended, are you ready to
     continue to the next one? Answer to continue."
     """
+    __slots__ = ('hand',)
+
     _result: ClassVar[HandResult]
 
     @property
@@ -364,10 +404,9 @@ class HandEnding(ABC):
 
         .. deprecated:: 2.0.0
         """
-        from warnings import warn
         warn('The result attribute is deprecated '
              'in favor of checking the type of the result '
-             'using isinstance().', DeprecationWarning)
+             'using isinstance().', DeprecationWarning, stacklevel=2)
         return self._result
 
     hand: Hand
@@ -378,7 +417,7 @@ class HandEnding(ABC):
         """
         return _answer(self.hand.gen)
 
-@dataclass
+@dataclass(eq=False)
 class NormalHandEnding(HandEnding):
     """A normal win; play advances.
 
@@ -387,6 +426,8 @@ class NormalHandEnding(HandEnding):
         wu: The winning hand.
         choice: The particular arrangement of melds to win.
     """
+    __slots__ = ('winner', 'wu', 'choice')
+
     _result = HandResult.NORMAL
 
     winner: Player
@@ -429,15 +470,17 @@ class NormalHandEnding(HandEnding):
         winner = self.winner
         wu = self.wu
         if table is None:
-            table = STOCK_TABLES['random_app']
-        limit = max(table.keys())
-        base = table[min(faan, limit)]
+            base = _DEFAULT_BASES[min(faan, len(_DEFAULT_BASES) - 1)]
+            if base is None:
+                raise KeyError(faan)
+        else:
+            base = table[min(faan, max(table))]
         flags = wu.flags(self.choice)
+        value = flags.value
         # special penalties that make the perpetrator pay
         # for everyone else on top of themselves
-        if ((WuFlag.TWELVE_PIECE in flags and WuFlag.SELF_DRAW in flags)
-                or (WuFlag.GAVE_KONG in flags and WuFlag.SELF_DRAW in flags)
-                or WuFlag.GAVE_DRAGON in flags) and wu.discarder is not None:
+        if ((value & _SELF_DRAW and value & _SELF_DRAW_PENALTIES)
+                or value & _GAVE_DRAGON) and wu.discarder is not None:
             points[winner.seat] += base * 3
             points[wu.discarder] -= base * 3
         # loser pays double in normal losing conditions
@@ -445,21 +488,19 @@ class NormalHandEnding(HandEnding):
             points[winner.seat] += base * 2
             points[wu.discarder] -= base * 2
         # self draw means everyone pays
-        elif WuFlag.SELF_DRAW in flags:
-            for i in range(4):
-                if i == winner.seat:
-                    points[i] += base * 3
-                else:
-                    points[i] -= base
+        elif value & _SELF_DRAW:
+            points = [-base] * 4
+            points[winner.seat] = base * 3
         else:
             raise ValueError('Somehow, nobody gets points. '
                              'Possibly report to maintainer with '
                              'the following information: '
-                             + str(self.wu.__dict__)
-                             + ' ;; ' + str(self.winner.__dict__))
+                             f'{wu!r} (arrived={wu.arrived!r}, '
+                             f'discarder={wu.discarder!r}, '
+                             f'flags={wu.base_flags!r}) ;; {winner!r}')
         return (points, flags)
 
-@dataclass
+@dataclass(eq=False)
 class Goulash(HandEnding):
     """The hand ended in a draw (goulash hand),
     so an extra round will be played with the seat winds unchanged
@@ -467,6 +508,8 @@ class Goulash(HandEnding):
 
     No attributes.
     """
+    __slots__ = ()
+
     _result = HandResult.GOULASH
 
     def faan(self) -> Tuple[int, None]:
@@ -498,6 +541,8 @@ class DealerWon(NormalHandEnding):
         This inherits from :class:`NormalHandEnding`, so call
         :func:`isinstance` on this class **first**, before the other one.
     """
+    __slots__ = ()
+
     _result = HandResult.DEALER_WON
 
 HandEndingType = Union[NormalHandEnding, Goulash, DealerWon]
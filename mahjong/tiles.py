@@ -1,7 +1,7 @@
 """Enums and the Tile class."""
 from __future__ import annotations
 from enum import Enum, IntEnum
-from typing import Union
+from typing import Dict, Tuple, Union
 
 __all__ = [
     'Suit',
@@ -14,6 +14,7 @@ __all__ = [
     'Flower',
     'Season',
     'ORDER',
+    'NUM_CODES',
     'Number',
 
     'Tile',
@@ -129,75 +130,125 @@ ORDER = {
 
 Number = Union[int, Wind, Dragon]
 
+# first Tile.code of each suit
+_SUIT_BASE = {
+    Simples.WAN: 0, Simples.TONG: 9, Simples.ZHU: 18,
+    Honors.FENG: 27, Honors.LONG: 31,
+    Bonuses.HUA: 34, Bonuses.GUI: 38,
+}
+# how many numbers each suit has
+_SUIT_SIZE = {
+    Simples.WAN: 9, Simples.TONG: 9, Simples.ZHU: 9,
+    Honors.FENG: 4, Honors.LONG: 3,
+    Bonuses.HUA: 4, Bonuses.GUI: 4,
+}
+# what Tile.number is converted to for each suit
+_NUMBER_TYPE = {
+    Simples.WAN: int, Simples.TONG: int, Simples.ZHU: int,
+    Honors.FENG: Wind, Honors.LONG: Dragon,
+    Bonuses.HUA: Flower, Bonuses.GUI: Season,
+}
+# every suit by its value, for parsing
+_SUITS: Dict[str, Suit] = {
+    suit.value: suit for kind in (Simples, Honors, Bonuses, Misc)
+    for suit in kind
+}
+# suit and number of every valid tile by its str(), for Tile.from_str
+_FROM_STR: Dict[str, Tuple[Suit, int]] = {
+    f'{suit.value}/{number+1}': (suit, number)
+    for suit, size in _SUIT_SIZE.items() for number in range(size)
+}
+# str() of every tile by its code
+_TILE_STRS = [''] * len(_FROM_STR)
+for _s, (_suit, _number) in _FROM_STR.items():
+    _TILE_STRS[_SUIT_BASE[_suit] + _number] = _s
+del _s, _suit, _number
+# number of distinct Tile.code values
+NUM_CODES = len(_TILE_STRS)
+
 class Tile:
     """Data class for tiles."""
+    # there are only 144 tiles, but they are read constantly
+    __slots__ = ('suit', 'number', 'code', 'is_simple', 'is_honor')
+
     suit: Suit
     number: Number
+    # unique small int per tile value, in sorting order for non-bonuses
+    code: int
+    # whether the suit is one of Simples, Honors or Bonuses, respectively
+    is_simple: bool
+    is_honor: bool
+    # fixed per class, so not a slot
+    is_bonus: bool = False
 
     def __init__(self, suit: Suit, number: Number):
         """Initialize Tile."""
-        self.suit = suit
-        self.number = number
-        if isinstance(suit, Simples):
-            max_num = 9
-        else:
-            max_num = 4
+        if isinstance(suit, Bonuses):
+            raise ValueError('Please use the BonusTile class for bonus tiles.')
+        self._set_number(suit, number)
+        self.is_simple = isinstance(suit, Simples)
+        self.is_honor = not self.is_simple
+
+    def _set_number(self, suit: Suit, number: Number) -> None:
+        """Check and set the suit, number and code of a new tile."""
+        number_type = _NUMBER_TYPE.get(suit)
+        if number_type is None:
+            raise ValueError(f'Invalid suit: {suit!r}')
+        max_num = _SUIT_SIZE[suit]
         if not (0 <= number < max_num):
             raise ValueError(f'Number {number+1} not in range [1, {max_num}]')
-        if isinstance(self.suit, Simples):
-            self.number = int(number)
-        elif self.suit == Honors.FENG:
-            self.number = Wind(number)
-        elif self.suit == Honors.LONG:
-            self.number = Dragon(number)
-        elif self.suit in Bonuses:
-            raise ValueError('Please use the BonusTile class for bonus tiles.')
-        else:
-            raise ValueError(f'Invalid suit: {self.suit!r}')
+        self.suit = suit
+        # tiles are mostly made from ints and enums already of the
+        # right type, which needn't be converted again
+        self.number = number if type(number) is number_type \
+            else number_type(number)
+        self.code = _SUIT_BASE[suit] + self.number
 
     @classmethod
     def from_str(cls, s: str) -> Union[Tile, BonusTile]:
         """Tile.from_str('suit/number') -> Tile | BonusTile"""
-        suit_s, number_s = s.split('/')
-        suit: Suit = Misc.UNKNOWN
-        for num in (Simples, Honors, Bonuses, Misc):
-            try:
-                suit = num(suit_s)
-            except ValueError:
-                continue
-            else:
-                break
-        else:
-            raise ValueError('Invalid suit')
-        number: int = int(number_s) - 1
+        parsed = _FROM_STR.get(s)
+        if parsed is None:
+            # either invalid or spelled unusually (e.g. 'wan/01'),
+            # so parse it fully for the right tile or error
+            parsed = _parse_str(s)
+        suit, number = parsed
         # number checking and casting is done by constructors
         if isinstance(suit, Bonuses):
             return BonusTile(suit, number)
         return cls(suit, number)
 
+    @classmethod
+    def from_code(cls, code: int) -> Union[Tile, BonusTile]:
+        """Tile.from_code(tile.code) -> Tile | BonusTile equal to tile"""
+        if not (0 <= code < NUM_CODES):
+            raise ValueError(f'Invalid tile code: {code}')
+        return cls.from_str(_TILE_STRS[code])
+
     def __str__(self) -> str:
         """str(tile) -> 'suit/number'"""
-        return f'{self.suit.value}/{self.number+1}'
+        return _TILE_STRS[self.code]
 
     __repr__ = __str__
 
     def __hash__(self):
-        return hash((self.suit, self.number))
+        # code is unique per suit and number
+        return self.code
 
     def __eq__(self, other: Tile) -> bool:
         """Tiles are equal when their suits and numbers are equal."""
         if not (isinstance(other, type(self)) or isinstance(self, type(other))):
             return NotImplemented
-        return hash(self) == hash(other)
+        return self.code == other.code
 
     def __lt__(self, other: Tile) -> bool:
         if not (isinstance(other, type(self)) or isinstance(self, type(other))):
             return NotImplemented
-        if self.suit == other.suit:
-            return self.number < other.number
-        if self.suit.value not in ORDER or other.suit.value not in ORDER:
-            return False
-        return ORDER[self.suit.value] < ORDER[other.suit.value]
+        # codes sort by ORDER then number, except between bonus suits
+        if self.suit is other.suit \
+                or not (self.is_bonus or other.is_bonus):
+            return self.code < other.code
+        return False
 
     # total ordering
     def __ne__(self, other: Tile) -> bool:
@@ -210,17 +261,26 @@ class Tile:
         return not (self < other)
 
 class BonusTile(Tile):
+    __slots__ = ()
+
     suit: Bonuses
     number: Union[int, Flower, Season]
+    is_bonus: bool = True
 
     def __init__(self, suit: Bonuses, number: Union[int, Flower, Season]):
         """Initialize Tile."""
-        if not (0 <= number < 4):
-            raise ValueError(f'Number {number+1} not in range [1, 4]')
-        self.suit = suit
-        if self.suit == Bonuses.HUA:
-            self.number = Flower(number)
-        elif self.suit == Bonuses.GUI:
-            self.number = Season(number)
-        else:
-            raise ValueError(f'Invalid BonusTile suit: {self.suit!r}')
+        if not isinstance(suit, Bonuses):
+            raise ValueError(f'Invalid BonusTile suit: {suit!r}')
+        self._set_number(suit, number)
+        self.is_simple = self.is_honor = False
+
+def _parse_str(s: str) -> Tuple[Suit, int]:
+    """Split 'suit/number' into a suit and a 0-based number."""
+    suit_s, sep, number_s = s.partition('/')
+    if not sep:
+        raise ValueError(f'Invalid tile string: {s!r}')
+    try:
+        suit = _SUITS[suit_s]
+    except KeyError:
+        raise ValueError('Invalid suit') from None
+    return suit, int(number_s) - 1
@@ -1,6 +1,7 @@
-from typing import Type
+from typing import Dict, List, Type
 import pytest
 import mahjong.game as game
+import mahjong.qna as qna
 
 @pytest.mark.parametrize('ending_type', (
     game.HandStart, game.TurnNext, game.NextSeat,
@@ -14,3 +15,116 @@ def test_Game():
     assert isinstance(gm.players, list), "did not set players"
     assert all(isinstance(p, game.Player) for p in gm.players), \
         "players are not Players"
+
+def tiles(s: str) -> List[game.Tile]:
+    return [game.Tile.from_str(tile) for tile in s.split('|')]
+
+def new_turn() -> game.Turn:
+    hand = game.Hand(None)
+    hand.gen = None # only needed to answer questions
+    return game.Turn(hand)
+
+@pytest.mark.parametrize(('discard', 'hand', 'chows'), (
+    ('wan/1', 'wan/2|wan/3|wan/4', ['wan/1|wan/2|wan/3']),
+    ('wan/5', 'wan/3|wan/4|wan/6|wan/7|wan/9',
+     ['wan/3|wan/4|wan/5', 'wan/4|wan/5|wan/6', 'wan/5|wan/6|wan/7']),
+    ('wan/9', 'wan/6|wan/7|wan/8', ['wan/7|wan/8|wan/9']),
+    ('zhu/5', 'wan/4|wan/6|tong/4|tong/6', []),
+    ('feng/1', 'feng/1|feng/2|feng/3', []),
+    ('long/2', 'long/1|long/2|long/3', []),
+    ('tong/2', 'tong/1|tong/1|tong/3|tong/3|tong/3',
+     ['tong/1|tong/2|tong/3']),
+))
+def test_Turn_chows_with(discard: str, hand: str, chows: List[str]):
+    assert [str(chow) for chow in game.Turn.chows_with(
+        game.Tile.from_str(discard), tiles(hand))] == chows, "wrong chows"
+
+def test_Turn_chows_with_discard():
+    discard = game.Tile.from_str('wan/5')
+    hand = tiles('wan/4|wan/5|wan/5|wan/6')
+    chows = game.Turn.chows_with(discard, hand)
+    assert [str(chow) for chow in chows] == ['wan/4|wan/5|wan/6'], \
+        "wrong chows"
+    # the discard replaces equal hand tiles, and the rest come from the hand
+    assert chows[0].tiles[1] is discard, "discard not in chow"
+    assert chows[0].tiles[0] is hand[0] and chows[0].tiles[2] is hand[3], \
+        "chow tiles not from hand"
+
+def test_Turn_check_others_melds():
+    turn = new_turn()
+    victim, next_player, across, last = turn.players
+    next_player.hand = tiles('wan/2|wan/3|tong/5|zhu/8')
+    across.hand = tiles('wan/1|wan/1|wan/2|wan/3')
+    last.hand = tiles('wan/2|wan/3|feng/1|feng/1')
+    asked: Dict[game.Wind, List[str]] = {}
+    gen = turn.check_others_melds(game.Tile.from_str('wan/1'), victim)
+    question = next(gen)
+    try:
+        while True:
+            assert isinstance(question, qna.MeldFromDiscardQ), \
+                "wrong question"
+            asked[question.player.seat] = list(map(str, question.melds))
+            question = gen.send(None)
+    except StopIteration as exc:
+        result = exc.value
+    # only the next seat may Chow; anyone may Pong
+    assert asked == {
+        next_player.seat: ['wan/1|wan/2|wan/3'],
+        across.seat: ['wan/1|wan/1|wan/1'],
+    }, "wrong melds offered"
+    assert result == (None, True), "next player not reported as asked"
+
+def test_Turn_melds_from_discard():
+    turn = new_turn()
+    victim, player = turn.players[:2]
+    player.hand = tiles('tong/5|tong/6|tong/7|tong/7|tong/7|tong/7|tong/8|'
+                        'feng/1|feng/1')
+    discard = game.Tile.from_str('tong/7')
+    turn.hand.discarded = [discard]
+    turn.hand.discarders = [victim]
+    gen = turn.melds_from_discard(player, game.NextSeat(
+        discard=discard, seat=player.seat, prev_seat=victim.seat))
+    question = next(gen)
+    assert isinstance(question, qna.MeldFromDiscardQ), "wrong question"
+    assert question.melds == [
+        game.Pong.from_str('tong/7|tong/7|tong/7'),
+        game.Chow.from_str('tong/5|tong/6|tong/7'),
+        game.Chow.from_str('tong/6|tong/7|tong/8'),
+        game.Kong.from_str('tong/7|tong/7|tong/7|tong/7'),
+    ], "wrong melds offered"
+    pong = question.melds[0]
+    with pytest.raises(StopIteration) as exc:
+        gen.send(pong)
+    assert exc.value.value is pong, "wrong meld returned"
+    assert player.shown == [pong], "meld not shown"
+    # the first equal tiles are shown, leaving the discard in the hand
+    assert list(map(str, player.hand)) == [
+        'tong/5', 'tong/6', 'tong/7', 'tong/8', 'feng/1', 'feng/1', 'tong/7'
+    ], "wrong tiles removed"
+    assert not turn.hand.discarded, "discard not taken"
+
+def test_Turn_check_ekfp():
+    turn = new_turn()
+    player = turn.players[0]
+    player.hand = tiles('tong/7|tong/7|tong/7|tong/7|feng/1|wan/3')
+    player.shown = [game.Pong.from_str('feng/1|feng/1|feng/1')]
+    gen = turn.check_ekfp(player.hand[-1], player)
+    question = next(gen)
+    assert type(question) is qna.ShowEKFCP, "wrong question"
+    assert question.melds == [
+        game.Kong.from_str('tong/7|tong/7|tong/7|tong/7')
+    ], "wrong concealed kongs"
+    # declining the concealed kong still offers the exposed one
+    question = gen.send(None)
+    assert type(question) is qna.ShowEKFEP, "wrong question"
+    assert question.melds == [
+        game.Kong.from_str('feng/1|feng/1|feng/1|feng/1')
+    ], "wrong exposed kongs"
+    kong = question.melds[0]
+    with pytest.raises(StopIteration) as exc:
+        gen.send(kong)
+    assert exc.value.value is kong, "wrong kong returned"
+    assert not player.shown, "pong not replaced"
+    assert list(map(str, player.hand)) == [
+        'tong/7', 'tong/7', 'tong/7', 'tong/7', 'wan/3'
+    ], "wrong tiles removed"
@@ -0,0 +1,141 @@
+from typing import Set, Tuple, Type
+import random
+import threading
+import time
+import pytest
+import mahjong.melds as melds
+
+@pytest.mark.parametrize(('hand', 'nine_gates'), (
+    ('wan/1|wan/1|wan/1|wan/2|wan/3|wan/4|wan/5|wan/6|wan/7|wan/8|wan/9|'
+     'wan/9|wan/9|wan/5', True),
+    ('zhu/1|zhu/1|zhu/1|zhu/2|zhu/3|zhu/4|zhu/5|zhu/6|zhu/7|zhu/8|zhu/9|'
+     'zhu/9|zhu/9|zhu/9', True),
+    ('tong/1|tong/1|tong/1|tong/2|tong/3|tong/4|tong/5|tong/6|tong/7|'
+     'tong/7|tong/8|tong/9|tong/9|tong/9', True),
+    ('tong/1|tong/2|tong/3|tong/2|tong/3|tong/4|tong/5|tong/6|tong/7|'
+     'tong/8|tong/8|tong/8|tong/4|tong/4', False),
+    ('wan/1|wan/1|wan/1|wan/2|wan/3|wan/4|wan/5|wan/6|wan/7|wan/9|wan/9|'
+     'wan/9|feng/1|feng/1', False),
+))
+def test_Wu_nine_gates(hand: str, nine_gates: bool):
+    wu = melds.Wu.from_str(hand)
+    _, _, flags = wu.max_faan()
+    if nine_gates:
+        assert melds.WuFlag.NINE_GATES in flags, "not nine gates"
+        assert melds.WuFlag.ALL_ONE_SUIT not in flags, "implied flag kept"
+    else:
+        assert melds.WuFlag.NINE_GATES not in flags, "wrongly nine gates"
+
+class _SlowPong(melds.Pong):
+    """Pong that gives up the GIL while hashed, e.g. as a cache key."""
+    def __hash__(self) -> int:
+        time.sleep(0)
+        return super().__hash__()
+
+def test_Wu_threads(monkeypatch: pytest.MonkeyPatch):
+    # a tiny cache makes every thread evict constantly
+    monkeypatch.setattr(melds, '_COMBO_CACHE_SIZE', 2)
+    fixed = [_SlowPong.from_str('long/1|long/1|long/1')]
+    tiles = [f'{suit}/{number}' for suit in ('wan', 'tong', 'zhu')
+             for number in range(1, 10)] * 4
+    errors = []
+
+    def build(seed: int):
+        rng = random.Random(seed)
+        try:
+            for _ in range(300):
+                try:
+                    melds.Wu.from_str('|'.join(rng.sample(tiles, 11)), fixed)
+                except ValueError:
+                    pass
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=build, args=(seed,))
+               for seed in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors, errors
+
+@pytest.mark.parametrize(('hand', 'fixed'), (
+    ('tong/1|tong/1|tong/1|tong/2|tong/2|tong/2|tong/3|tong/3|tong/3|'
+     'tong/4|tong/4|tong/4|tong/5|tong/5', ()),
+    ('wan/1|wan/2|wan/3|zhu/7|zhu/8|zhu/9|feng/3|feng/3',
+     ((melds.Pong, 'long/1|long/1|long/1'),
+      (melds.Chow, 'tong/4|tong/5|tong/6'))),
+    ('tong/1|tong/9|zhu/1|zhu/9|wan/1|wan/9|feng/1|feng/2|feng/3|feng/4|'
+     'long/1|long/2|long/3|wan/9', ()),
+))
+def test_Wu_cached_melds(hand: str,
+                         fixed: Tuple[Tuple[Type[melds.Meld], str], ...]):
+    for _ in range(2): # the second Wu reuses the first one's combos
+        shown = [cls.from_str(meld) for cls, meld in fixed]
+        wu = melds.Wu.from_str(hand, shown)
+    for combo in wu.melds:
+        for meld in combo:
+            if any(meld is fixed_meld for fixed_meld in shown):
+                continue
+            assert all(any(tile is own for own in wu.tiles)
+                       for tile in meld.tiles), "melds use other Wu's tiles"
+        assert sum(any(meld is fixed_meld for meld in combo)
+                   for fixed_meld in shown) == len(shown), \
+            "fixed melds not the Wu's own"
+
+@pytest.mark.parametrize(('hand', 'fixed', 'combos'), (
+    # many ways to choose eyes, and Pongs or Chows of the same tiles
+    ('tong/1|tong/1|tong/1|tong/2|tong/2|tong/2|tong/3|tong/3|tong/3|'
+     'tong/4|tong/4|tong/4|tong/5|tong/5', (), {
+         'tong/2|tong/2 tong/2|tong/3|tong/4 tong/3|tong/4|tong/5 '
+         'tong/3|tong/4|tong/5 tong/1|tong/1|tong/1',
+         'tong/5|tong/5 tong/1|tong/1|tong/1 tong/2|tong/2|tong/2 '
+         'tong/3|tong/3|tong/3 tong/4|tong/4|tong/4',
+         'tong/5|tong/5 tong/1|tong/2|tong/3 tong/1|tong/2|tong/3 '
+         'tong/1|tong/2|tong/3 tong/4|tong/4|tong/4',
+         'tong/5|tong/5 tong/2|tong/3|tong/4 tong/2|tong/3|tong/4 '
+         'tong/2|tong/3|tong/4 tong/1|tong/1|tong/1',
+     }),
+    # three Pongs or three of the same Chow
+    ('wan/1|wan/1|wan/1|wan/2|wan/2|wan/2|wan/3|wan/3|wan/3|zhu/5|zhu/6|'
+     'zhu/7|long/1|long/1', (), {
+         'long/1|long/1 wan/1|wan/2|wan/3 wan/1|wan/2|wan/3 '
+         'wan/1|wan/2|wan/3 zhu/5|zhu/6|zhu/7',
+         'long/1|long/1 zhu/5|zhu/6|zhu/7 wan/1|wan/1|wan/1 '
+         'wan/2|wan/2|wan/2 wan/3|wan/3|wan/3',
+     }),
+    ('wan/2|wan/3|wan/4|wan/4|wan/4|zhu/7|zhu/8|zhu/9',
+     ((melds.Pong, 'long/1|long/1|long/1'),
+      (melds.Chow, 'tong/4|tong/5|tong/6')), {
+         'wan/4|wan/4 wan/2|wan/3|wan/4 tong/4|tong/5|tong/6 '
+         'zhu/7|zhu/8|zhu/9 long/1|long/1|long/1',
+     }),
+    # a spare tile, so not every tile has to be used
+    ('wan/1|wan/2|wan/3|wan/4|wan/5|wan/6|tong/2|tong/3|tong/4|zhu/5|zhu/6|'
+     'zhu/7|long/1|long/1|wan/7', (), {
+         'long/1|long/1 wan/1|wan/2|wan/3 wan/4|wan/5|wan/6 '
+         'tong/2|tong/3|tong/4 zhu/5|zhu/6|zhu/7',
+         'long/1|long/1 wan/1|wan/2|wan/3 wan/5|wan/6|wan/7 '
+         'tong/2|tong/3|tong/4 zhu/5|zhu/6|zhu/7',
+         'long/1|long/1 wan/2|wan/3|wan/4 wan/5|wan/6|wan/7 '
+         'tong/2|tong/3|tong/4 zhu/5|zhu/6|zhu/7',
+     }),
+    ('tong/1|tong/9|zhu/1|zhu/9|wan/1|wan/9|feng/1|feng/2|feng/3|feng/4|'
+     'long/1|long/2|long/3|wan/9', (), {
+         'wan/1|wan/9|wan/9|tong/1|tong/9|zhu/1|zhu/9|'
+         'feng/1|feng/2|feng/3|feng/4|long/1|long/2|long/3',
+     }),
+    # no eyes
+    ('wan/1|wan/2|wan/3|wan/4|wan/5|wan/6|tong/2|tong/3|tong/4|zhu/5|zhu/6|'
+     'zhu/7|long/1|long/2', (), set()),
+))
+def test_Wu_melds(hand: str, fixed: Tuple[Tuple[Type[melds.Meld], str], ...],
+                  combos: Set[str]):
+    shown = [cls.from_str(meld) for cls, meld in fixed]
+    if not combos:
+        with pytest.raises(ValueError):
+            melds.Wu.from_str(hand, shown)
+        return
+    wu = melds.Wu.from_str(hand, shown)
+    assert {' '.join(map(str, combo)) for combo in wu.melds} == combos, \
+        "wrong combos"
@@ -0,0 +1,33 @@
+import pytest
+import mahjong.melds as melds
+import mahjong.players as players
+import mahjong.tiles as tiles
+
+def test_Player_show_meld():
+    player = players.Player(0)
+    player.hand = list(map(tiles.Tile.from_str, (
+        'wan/1', 'wan/2', 'wan/3', 'wan/2', 'long/1', 'wan/2')))
+    hand = player.hand
+    kept = [hand[0], hand[2], hand[4]]
+    discard = tiles.Tile.from_str('wan/2')
+    pong = melds.Pong.from_str('wan/2|wan/2|wan/2')
+    player.show_meld(discard, pong)
+    assert player.shown == [pong], "meld not shown"
+    # the first equal tiles go, so the discard stays in the hand
+    assert player.hand == kept + [discard] \
+        and all(a is b for a, b in zip(player.hand, kept + [discard])), \
+        "wrong tiles removed"
+    assert player.hand is hand, "hand replaced"
+
+def test_Player_show_meld_missing():
+    player = players.Player(0)
+    player.hand = list(map(tiles.Tile.from_str, (
+        'wan/1', 'wan/2', 'wan/4', 'long/1')))
+    before = list(player.hand)
+    discard = tiles.Tile.from_str('wan/1')
+    with pytest.raises(ValueError):
+        player.show_meld(discard, melds.Pong.from_str('wan/1|wan/1|wan/1'))
+    assert player.hand == before \
+        and all(a is b for a, b in zip(player.hand, before)), \
+        "hand changed on error"
+    assert not player.shown, "meld shown on error"
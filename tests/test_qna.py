@@ -0,0 +1,34 @@
+from typing import List, Optional
+import pytest
+import mahjong.game as game
+import mahjong.melds as melds
+import mahjong.qna as qna
+
+HAND = ('wan/1|wan/2|wan/3|wan/4|wan/5|wan/6|tong/2|tong/3|tong/4|'
+        'zhu/5|zhu/6|zhu/7|long/1|long/1')
+
+@pytest.mark.parametrize(('discarder', 'flags', 'multipliers'), (
+    (1, melds.WuFlag.CHICKEN_HAND, [2, -2, 0, 0]),
+    (3, melds.WuFlag.CHICKEN_HAND, [2, 0, 0, -2]),
+    (None, melds.WuFlag.SELF_DRAW, [3, -1, -1, -1]),
+    (2, melds.WuFlag.SELF_DRAW | melds.WuFlag.TWELVE_PIECE, [3, 0, -3, 0]),
+    (2, melds.WuFlag.SELF_DRAW | melds.WuFlag.GAVE_KONG, [3, 0, -3, 0]),
+    (1, melds.WuFlag.TWELVE_PIECE, [2, -2, 0, 0]),
+    (1, melds.WuFlag.GAVE_DRAGON, [3, -3, 0, 0]),
+))
+def test_NormalHandEnding_points(discarder: Optional[int],
+                                 flags: melds.WuFlag,
+                                 multipliers: List[int]):
+    wu = melds.Wu.from_str(HAND, None, None, discarder, flags)
+    hand = game.Hand(None)
+    hand.wind = game.Wind.EAST # normally set when the hand is played
+    ending = qna.NormalHandEnding(hand=hand,
+                                  winner=game.Player(0),
+                                  wu=wu, choice=wu.melds[0])
+    faan, _ = ending.faan()
+    base = qna.STOCK_TABLES['random_app'][faan]
+    points, ending_flags = ending.points(min_faan=1)
+    assert points == [base * mult for mult in multipliers], "wrong points"
+    assert ending_flags == wu.flags(wu.melds[0]), "wrong flags"
+    assert ending.points(min_faan=faan + 1) == ([0, 0, 0, 0], None), \
+        "points given below minimum faan"
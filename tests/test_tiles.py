@@ -18,6 +18,9 @@ def test_Tile():
     tile = tiles.Tile(tiles.Honors.LONG, 0)
     assert isinstance(tile.number, tiles.Dragon), "not converted"
     assert tile.number == tiles.Dragon.RED, "converted incorrectly"
+    assert tile.is_honor and not tile.is_simple, "wrong suit kind"
+    tile = tiles.Tile(tiles.Simples.ZHU, 8)
+    assert tile.is_simple and not tile.is_honor, "wrong suit kind"
 
     with pytest.raises(ValueError):
         tile = tiles.Tile(tiles.Bonuses.GUI, 0)
@@ -119,6 +122,29 @@ def test_Tile_lt(tile1: tiles.Tile, tile2: tiles.Tile,
         with pytest.raises(value_or_exc):
             assert tile1 < tile2
 
+def test_Tile_code():
+    all_tiles = [tiles.Tile(suit, num) for suit in tiles.Simples
+                 for num in range(9)]
+    all_tiles += [tiles.Tile(suit, num) for suit in tiles.Honors
+                  for num in range(4 if suit is tiles.Honors.FENG else 3)]
+    all_tiles.sort()
+    assert [tile.code for tile in all_tiles] == list(range(34)), \
+        "codes not in sorting order"
+    codes = {tiles.BonusTile(suit, num).code for suit in tiles.Bonuses
+             for num in range(4)}
+    assert codes == set(range(34, 42)), "bonus codes overlap"
+
+def test_Tile_from_code():
+    for code in range(42):
+        tile = tiles.Tile.from_code(code)
+        assert tile.code == code, "wrong tile"
+        assert tiles.Tile.from_str(str(tile)) == tile, "wrong tile"
+    assert isinstance(tiles.Tile.from_code(34), tiles.BonusTile), \
+        "not a bonus tile"
+    for code in (-1, 42):
+        with pytest.raises(ValueError):
+            tiles.Tile.from_code(code)
+
 def test_BonusTile():
     tile = tiles.BonusTile(tiles.Bonuses.GUI, 0)
     assert isinstance(tile.number, tiles.Season), "not converted"
@@ -130,3 +156,13 @@ def test_BonusTile():
     with pytest.raises(ValueError):
         # testing typecheck; ignoring types
         tile = tiles.BonusTile(tiles.Simples.WAN, 0) # type: ignore
+
+@pytest.mark.parametrize(('s', 'is_simple', 'is_honor', 'is_bonus'), (
+    ('wan/1', True, False, False),
+    ('feng/2', False, True, False),
+    ('hua/3', False, False, True),
+))
+def test_Tile_kind(s: str, is_simple: bool, is_honor: bool, is_bonus: bool):
+    tile = tiles.Tile.from_str(s)
+    assert (tile.is_simple, tile.is_honor, tile.is_bonus) \
+        == (is_simple, is_honor, is_bonus), "wrong suit kind"